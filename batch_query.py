@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Batch Query Runner
+Runs a file of legal questions through the assistant without an interactive prompt
+
+Input is JSONL, one question per line, either as an object
+({"id": "q1", "question": "..."}) or as a bare JSON string. Results are
+streamed as JSONL in completion order, one line per input question.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from typing import Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from query_cache import normalize_question
+
+
+def read_questions(stream: TextIO) -> Iterator[Tuple[str, str]]:
+    """Yield (id, question) pairs from a JSONL stream"""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {line_number}: invalid JSON ({e})") from e
+
+        if isinstance(item, str):
+            question_id, question = str(line_number), item
+        elif isinstance(item, dict):
+            question = item.get("question") or item.get("query")
+            question_id = str(item.get("id", line_number))
+        else:
+            question = None
+
+        if not isinstance(question, str) or not question.strip():
+            raise ValueError(f"Line {line_number}: expected a question string or an object with a 'question' field")
+
+        yield question_id, question
+
+
+class BatchQueryRunner:
+    """Runs question sets through an assistant on a worker pool, deduplicating and caching answers"""
+
+    def __init__(self, assistant, workers: int = 4):
+        self.assistant = assistant
+        self.workers = workers
+        self._cache: Dict[Tuple[int, str], str] = {}
+        self._write_lock = threading.Lock()
+
+        # Answers describe the matter data at the time they were produced
+        if hasattr(assistant, "on_data_change"):
+            assistant.on_data_change(lambda data_version: self._cache.clear())
+
+    def _cache_key(self, question: str) -> Tuple[int, str]:
+        return getattr(self.assistant, "data_version", 0), normalize_question(question)
+
+    def _answer(self, question: str) -> Tuple[str, float]:
+        started = time.perf_counter()
+        result = self.assistant.process_query(question)
+        return str(result), (time.perf_counter() - started) * 1000
+
+    def _emit(self, output: TextIO, record: dict):
+        with self._write_lock:
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+
+    def run(self, questions: Iterable[Tuple[str, str]], output: TextIO) -> dict:
+        """Answer every question, streaming one JSONL result per question to output"""
+        started = time.perf_counter()
+        pending: Dict[Tuple[int, str], List[Tuple[str, str]]] = {}
+        summary = {"questions": 0, "unique": 0, "cached": 0, "errors": 0}
+
+        for question_id, question in questions:
+            summary["questions"] += 1
+            key = self._cache_key(question)
+
+            # Single read: the watcher thread may clear the cache at any time
+            cached_result = self._cache.get(key)
+            if cached_result is not None:
+                summary["cached"] += 1
+                self._emit(output, {
+                    "id": question_id,
+                    "question": question,
+                    "result": cached_result,
+                    "error": None,
+                    "elapsed_ms": 0.0,
+                    "cached": True,
+                })
+            else:
+                pending.setdefault(key, []).append((question_id, question))
+
+        summary["unique"] = len(pending)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(self._answer, waiting[0][1]): key
+                for key, waiting in pending.items()
+            }
+
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    result, elapsed_ms = future.result()
+                    error = None
+                    self._cache[key] = result
+                except Exception as e:
+                    result, elapsed_ms, error = None, 0.0, str(e)
+                    summary["errors"] += len(pending[key])
+
+                # The first asker pays for the answer; identical questions share it
+                for position, (question_id, question) in enumerate(pending[key]):
+                    shared = position > 0
+                    if shared and error is None:
+                        summary["cached"] += 1
+                    self._emit(output, {
+                        "id": question_id,
+                        "question": question,
+                        "result": result,
+                        "error": error,
+                        "elapsed_ms": 0.0 if shared else round(elapsed_ms, 1),
+                        "cached": shared,
+                    })
+
+        summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run a JSONL file of legal questions through the assistant")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL question file ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL result file ('-' for stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Questions processed in parallel")
+    parser.add_argument("--csv-file", default="litify_matters.csv", help="Litify matters CSV export")
+    parser.add_argument("--db-path", default="legal_matters.db", help="SQLite matter database")
+    args = parser.parse_args(argv)
+
+    input_stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    try:
+        questions = list(read_questions(input_stream))
+
+        # Agent chatter goes to stderr so stdout stays valid JSONL
+        with redirect_stdout(sys.stderr):
+            from legal_ai_assistant import LegalAIAssistant
+            assistant = LegalAIAssistant(csv_file=args.csv_file, db_path=args.db_path)
+            summary = BatchQueryRunner(assistant, workers=args.workers).run(questions, output_stream)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+    print(
+        f"✅ Answered {summary['questions']} questions "
+        f"({summary['unique']} unique, {summary['cached']} cached, {summary['errors']} errors) "
+        f"in {summary['elapsed_ms'] / 1000:.1f}s",
+        file=sys.stderr
+    )
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+CSV Change Watcher
+Applies updates to the Litify CSV export to the matter database while queries keep running
+"""
+
+import csv
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from legal_ai_assistant import read_matter_rows
+
+MATTER_TABLE = "litify_pm__Matter__c"
+
+# Bytes before the read offset that must be unchanged for growth to count as an append
+TAIL_FINGERPRINT_BYTES = 4096
+
+
+class CSVChangeWatcher(threading.Thread):
+    """Background thread that detects CSV appends and replacements and syncs them into the DB
+
+    The database is switched to WAL mode so readers are never blocked, and
+    changes are written in small transactions of batch_size rows. After each
+    applied change the assistant's data version is bumped, which invalidates
+    caches that depend on matter rows. Exports that replace the file should
+    write to a temporary name and rename it into place.
+    """
+
+    def __init__(self, assistant, poll_interval: float = 2.0, batch_size: int = 500,
+                 sync_on_start: bool = True):
+        super().__init__(name=f"csv-watcher:{assistant.csv_file}", daemon=True)
+        self.assistant = assistant
+        self.csv_file = assistant.csv_file
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.sync_on_start = sync_on_start
+
+        self._stop_event = threading.Event()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stat: Optional[os.stat_result] = None
+        self._offset = 0
+        self._tail_digest = b""
+        self._ends_with_newline = False
+        self._width = 0
+        # File identity at the last sync that held back deletes
+        self._pending_delete_identity: Optional[tuple] = None
+
+    def stop(self, timeout: Optional[float] = None):
+        """Ask the watcher to finish and wait for it"""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        started = False
+        try:
+            # A missing or unreadable CSV at startup is retried on every poll
+            while True:
+                try:
+                    if self._conn is None:
+                        self._connect()
+                    if started:
+                        self.check_once()
+                    elif self.sync_on_start:
+                        self.full_sync()
+                    else:
+                        self._remember_file_position(os.stat(self.csv_file))
+                    started = True
+                except (OSError, sqlite3.Error, csv.Error) as e:
+                    print(f"⚠️  CSV watcher could not apply changes from {self.csv_file}: {e}")
+
+                if self._stop_event.wait(self.poll_interval):
+                    break
+        finally:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def check_once(self) -> int:
+        """Apply any change since the last check; returns the number of rows changed"""
+        if self._conn is None:
+            self._connect()
+
+        try:
+            stat = os.stat(self.csv_file)
+        except FileNotFoundError:
+            # Mid-replacement; pick the new file up on the next poll
+            return 0
+
+        previous = self._stat
+        if previous is not None and self._pending_delete_identity is None and \
+                _identity(stat) == _identity(previous):
+            return 0
+
+        # Growth only counts as an append if the applied part ended in a newline;
+        # otherwise the first new row would be glued onto the previous last line
+        if (previous is not None and self._pending_delete_identity is None
+                and self._ends_with_newline and stat.st_ino == previous.st_ino
+                and stat.st_size > self._offset and self._tail_unchanged()):
+            return self.apply_append()
+        return self.full_sync()
+
+    def apply_append(self) -> int:
+        """Upsert rows appended after the last read offset"""
+        stat = os.stat(self.csv_file)
+        with open(self.csv_file, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read(stat.st_size - self._offset)
+
+        # Leave a partially written last line for the next poll
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            return 0
+
+        reader = csv.reader(io.StringIO(chunk[:end].decode("utf-8"), newline=""))
+        rows = [self._pad(row) for row in reader if row]
+        self._upsert(rows)
+        self._remember_file_position(stat, self._offset + end)
+
+        if rows:
+            print(f"🔄 Applied {len(rows)} appended rows from {self.csv_file}")
+            self.assistant.notify_data_changed()
+        return len(rows)
+
+    def full_sync(self) -> int:
+        """Diff the whole CSV against the table and apply inserts, updates and deletes
+
+        Deletes are only applied once the file is unchanged across two polls,
+        so a truncated or half-written export cannot remove matters; a file
+        with no rows at all never deletes anything.
+        """
+        stat = os.stat(self.csv_file)
+        rows = read_matter_rows(self.csv_file)
+        self._width = len(rows[0]) if rows else self._width
+
+        incoming: Dict[str, tuple] = {row[0]: row for row in rows}
+        existing: Dict[str, tuple] = {
+            row[0]: row for row in self._conn.execute(f"SELECT * FROM {MATTER_TABLE}")
+        }
+
+        changed = [row for matter_id, row in incoming.items() if existing.get(matter_id) != row]
+        removed = [(matter_id,) for matter_id in existing.keys() - incoming.keys()]
+
+        deferred = 0
+        if removed and not incoming:
+            print(f"⚠️  {self.csv_file} has no matter rows; keeping the {len(removed)} existing matters")
+            deferred, removed = len(removed), []
+            self._pending_delete_identity = None
+        elif removed and self._pending_delete_identity != _identity(stat):
+            # Checked again on the next poll; deleted only if the file is still the same
+            self._pending_delete_identity = _identity(stat)
+            deferred, removed = len(removed), []
+        else:
+            self._pending_delete_identity = None
+
+        self._upsert(changed)
+        for start in range(0, len(removed), self.batch_size):
+            with self._conn:
+                self._conn.executemany(
+                    f"DELETE FROM {MATTER_TABLE} WHERE Id = ?", removed[start:start + self.batch_size]
+                )
+
+        self._remember_file_position(stat)
+        if changed or removed:
+            print(f"🔄 Synced {self.csv_file}: {len(changed)} inserted/updated, {len(removed)} deleted")
+            self.assistant.notify_data_changed()
+        if deferred and self._pending_delete_identity is not None:
+            print(f"⏳ {deferred} matters missing from {self.csv_file}; deleting them if it is unchanged at the next poll")
+        return len(changed) + len(removed)
+
+    def _connect(self):
+        self._conn = sqlite3.connect(self.assistant.db_path, timeout=30.0)
+        # WAL lets readers keep querying the previous snapshot while we write
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+    def _upsert(self, rows: List[tuple]):
+        placeholders = ", ".join("?" * len(rows[0])) if rows else ""
+        for start in range(0, len(rows), self.batch_size):
+            with self._conn:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO {MATTER_TABLE} VALUES ({placeholders})",
+                    rows[start:start + self.batch_size]
+                )
+
+    def _pad(self, row: List[str]) -> tuple:
+        return tuple(row + [""] * (self._width - len(row)))
+
+    def _read_tail(self, offset: int) -> bytes:
+        start = max(0, offset - TAIL_FINGERPRINT_BYTES)
+        with open(self.csv_file, "rb") as f:
+            f.seek(start)
+            return f.read(offset - start)
+
+    def _tail_unchanged(self) -> bool:
+        return hashlib.sha256(self._read_tail(self._offset)).digest() == self._tail_digest
+
+    def _remember_file_position(self, stat: os.stat_result, offset: Optional[int] = None):
+        """Record the file identity (as stat'ed before reading) and how far it has been applied"""
+        self._stat = stat
+        self._offset = stat.st_size if offset is None else offset
+        tail = self._read_tail(self._offset)
+        self._tail_digest = hashlib.sha256(tail).digest()
+        self._ends_with_newline = self._offset == 0 or tail.endswith(b"\n")
+        if not self._width:
+            with open(self.csv_file, newline="", encoding="utf-8") as f:
+                self._width = len(next(csv.reader(f), []))
+
+
+def _identity(stat: os.stat_result) -> tuple:
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def watch_csv(assistant, poll_interval: float = 2.0, batch_size: int = 500) -> CSVChangeWatcher:
+    """Start a watcher thread that keeps the assistant's database in sync with its CSV"""
+    watcher = CSVChangeWatcher(assistant, poll_interval=poll_interval, batch_size=batch_size)
+    watcher.start()
+    return watcher
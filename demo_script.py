@@ -50,49 +50,49 @@ e94b89a4e1ce6e8626,Morgan Smith,[Account],Morgan Davis,[RecordType],Personal Inj
     print("📊 Data matches exact Litify/Salesforce field structure")
     print("🔄 Ready for SOQL simulation")
 
+# Demo queries for customer presentation - Updated for Litify structure
+DEMO_QUERIES = [
+    {
+        "query": "How many personal injury cases do we have in the system?",
+        "description": "Count by case type - demonstrates Litify categorization"
+    },
+    {
+        "query": "Which attorney is handling the most matters?",
+        "description": "Attorney workload analysis - shows performance metrics"
+    },
+    {
+        "query": "What's the breakdown of case stages in our matters?",
+        "description": "Case pipeline analysis - demonstrates workflow insights"
+    },
+    {
+        "query": "Show me all matters that were settled pre-litigation",
+        "description": "Settlement analysis - shows case outcome filtering"
+    },
+    {
+        "query": "Which clients have the most matters with us?",
+        "description": "Client relationship analysis - demonstrates CRM insights"
+    },
+    {
+        "query": "How many matters were closed this year?",
+        "description": "Productivity metrics - shows temporal analysis"
+    },
+    {
+        "query": "What are the different record types we handle?",
+        "description": "Practice area overview - shows service categorization"
+    },
+    {
+        "query": "Show me the average case duration for closed matters",
+        "description": "Efficiency analysis - demonstrates time tracking"
+    }
+]
+
 def run_demo():
     """Run the demo with predefined queries"""
     print("\n🎯 Running Legal AI Assistant Demo")
     print("=" * 50)
     
-    # Demo queries for customer presentation - Updated for Litify structure
-    demo_queries = [
-        {
-            "query": "How many personal injury cases do we have in the system?",
-            "description": "Count by case type - demonstrates Litify categorization"
-        },
-        {
-            "query": "Which attorney is handling the most matters?",
-            "description": "Attorney workload analysis - shows performance metrics"
-        },
-        {
-            "query": "What's the breakdown of case stages in our matters?",
-            "description": "Case pipeline analysis - demonstrates workflow insights"
-        },
-        {
-            "query": "Show me all matters that were settled pre-litigation",
-            "description": "Settlement analysis - shows case outcome filtering"
-        },
-        {
-            "query": "Which clients have the most matters with us?",
-            "description": "Client relationship analysis - demonstrates CRM insights"
-        },
-        {
-            "query": "How many matters were closed this year?",
-            "description": "Productivity metrics - shows temporal analysis"
-        },
-        {
-            "query": "What are the different record types we handle?",
-            "description": "Practice area overview - shows service categorization"
-        },
-        {
-            "query": "Show me the average case duration for closed matters",
-            "description": "Efficiency analysis - demonstrates time tracking"
-        }
-    ]
-    
     print("🎯 Available Demo Queries (Litify/Salesforce Integration):")
-    for i, demo in enumerate(demo_queries, 1):
+    for i, demo in enumerate(DEMO_QUERIES, 1):
         print(f"{i}. {demo['query']}")
         print(f"   📈 Business Value: {demo['description']}")
         print()
@@ -101,6 +101,11 @@ def run_demo():
     try:
         from legal_ai_assistant import LegalAIAssistant
         assistant = LegalAIAssistant(csv_file="litify_matters.csv")
+        assistant.warm_query_cache([demo['query'] for demo in DEMO_QUERIES])
+        
+        # Pick up new Litify exports while the demo is running
+        from csv_watcher import watch_csv
+        watcher = watch_csv(assistant)
         
         print("✅ Legal AI Assistant initialized with Litify data structure!")
         print("🔗 Simulating Salesforce/Litify API integration")
@@ -108,55 +113,58 @@ def run_demo():
         print("🚀 DEMO MODE - Litify/Salesforce Integration Proof of Concept")
         print("="*60)
         
-        while True:
-            print("\n🎯 Select a demo query (1-8) or enter 'custom' for your own:")
-            choice = input("Choice (or 'quit' to exit): ").strip()
+        try:
+            while True:
+                print("\n🎯 Select a demo query (1-8) or enter 'custom' for your own:")
+                choice = input("Choice (or 'quit' to exit): ").strip()
             
-            if choice.lower() == 'quit':
-                break
-            elif choice.lower() == 'custom':
-                query = input("Enter your custom query: ").strip()
-                description = "Custom query for Litify data"
-            elif choice.isdigit() and 1 <= int(choice) <= len(demo_queries):
-                demo = demo_queries[int(choice) - 1]
-                query = demo['query']
-                description = demo['description']
-            else:
-                print("❌ Invalid choice. Please try again.")
-                continue
+                if choice.lower() == 'quit':
+                    break
+                elif choice.lower() == 'custom':
+                    query = input("Enter your custom query: ").strip()
+                    description = "Custom query for Litify data"
+                elif choice.isdigit() and 1 <= int(choice) <= len(DEMO_QUERIES):
+                    demo = DEMO_QUERIES[int(choice) - 1]
+                    query = demo['query']
+                    description = demo['description']
+                else:
+                    print("❌ Invalid choice. Please try again.")
+                    continue
             
-            print(f"\n🔍 Processing Litify Query: {query}")
-            print(f"📊 Business Purpose: {description}")
-            print("🔄 Simulating Salesforce API call...")
-            print("-" * 60)
+                print(f"\n🔍 Processing Litify Query: {query}")
+                print(f"📊 Business Purpose: {description}")
+                print("🔄 Simulating Salesforce API call...")
+                print("-" * 60)
             
-            try:
-                result = assistant.process_query(query)
-                print(f"\n📋 AI Assistant Result:")
-                print("=" * 60)
-                print(f"{result}")
+                try:
+                    result = assistant.process_query(query)
+                    print(f"\n📋 AI Assistant Result:")
+                    print("=" * 60)
+                    print(f"{result}")
                 
-                print(f"\n🚀 Production Implementation Notes:")
-                print("- Real Salesforce endpoint: https://yourcompany.my.salesforce.com/services/data/v58.0/query")
-                print("- OAuth 2.0 authentication required")
-                print("- SOQL query executed against live litify_pm__Matter__c objects")
-                print("- Real-time legal matter data from Litify platform")
-                print("- Secure API integration with proper error handling")
+                    print(f"\n🚀 Production Implementation Notes:")
+                    print("- Real Salesforce endpoint: https://yourcompany.my.salesforce.com/services/data/v58.0/query")
+                    print("- OAuth 2.0 authentication required")
+                    print("- SOQL query executed against live litify_pm__Matter__c objects")
+                    print("- Real-time legal matter data from Litify platform")
+                    print("- Secure API integration with proper error handling")
                 
-                print("\n" + "="*60)
+                    print("\n" + "="*60)
                 
-                # Ask if they want to continue
-                continue_demo = input("\n🔄 Continue with another query? (y/n): ").strip().lower()
-                if continue_demo != 'y':
-                    print("✅ Demo completed successfully!")
-                    break
+                    # Ask if they want to continue
+                    continue_demo = input("\n🔄 Continue with another query? (y/n): ").strip().lower()
+                    if continue_demo != 'y':
+                        print("✅ Demo completed successfully!")
+                        break
                     
-            except Exception as e:
-                print(f"❌ Error processing query: {e}")
-                print("💡 Common issues:")
-                print("  - Check OpenAI API key in .env file")
-                print("  - Ensure all dependencies are installed")
-                print("  - Verify CSV file structure matches Litify format")
+                except Exception as e:
+                    print(f"❌ Error processing query: {e}")
+                    print("💡 Common issues:")
+                    print("  - Check OpenAI API key in .env file")
+                    print("  - Ensure all dependencies are installed")
+                    print("  - Verify CSV file structure matches Litify format")
+        finally:
+            watcher.stop()
                 
     except ImportError as e:
         print("❌ Could not import LegalAIAssistant.")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Import Time Benchmark
+Guards the startup cost of the CLI and demo entry points using `python -X importtime`
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+# Cumulative import time budgets in milliseconds, measured in a fresh interpreter
+IMPORT_BUDGETS_MS = {
+    "legal_ai_assistant": 100,
+    "demo_script": 50,
+    "tenant_registry": 150,
+}
+
+# Modules that must only load once an LLM-backed query runs
+HEAVY_MODULES = ("crewai", "crewai_tools", "langchain", "pandas")
+
+REPO_DIR = Path(__file__).resolve().parent
+
+
+def measure_import(module: str, runs: int = 5):
+    """Return the best cumulative import time (ms) and the set of imported top-level packages"""
+    best_ms = None
+    imported = set()
+
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+
+        cumulative_us = None
+        for line in proc.stderr.splitlines():
+            # Format: "import time:  self [us] | cumulative | imported package"
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            parts = [part.strip() for part in line[len("import time:"):].split("|")]
+            if not parts[1].isdigit():
+                continue
+            name = parts[2].strip()
+            imported.add(name.split(".")[0])
+            if name == module:
+                cumulative_us = int(parts[1])
+
+        if cumulative_us is None:
+            raise RuntimeError(f"No importtime entry found for {module}")
+        elapsed_ms = cumulative_us / 1000
+        best_ms = elapsed_ms if best_ms is None else min(best_ms, elapsed_ms)
+
+    return best_ms, imported
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module (best run is kept)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget, e.g. for slow CI hosts")
+    args = parser.parse_args(argv)
+
+    print("⏱️  Import time benchmark")
+    print("=" * 50)
+
+    failures = []
+    for module, budget_ms in IMPORT_BUDGETS_MS.items():
+        elapsed_ms, imported = measure_import(module, runs=args.runs)
+        budget_ms *= args.scale
+        heavy = sorted(set(HEAVY_MODULES) & imported)
+
+        status = "✅" if elapsed_ms <= budget_ms and not heavy else "❌"
+        print(f"{status} {module}: {elapsed_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+
+        if elapsed_ms > budget_ms:
+            failures.append(f"{module} took {elapsed_ms:.1f} ms, over its {budget_ms:.0f} ms budget")
+        if heavy:
+            failures.append(f"{module} eagerly imports {', '.join(heavy)}")
+
+    if failures:
+        print("\n❌ Import time regressions:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+
+    print("\n✅ All entry points within their import budgets")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
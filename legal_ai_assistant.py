@@ -1,19 +1,134 @@
+import json
 import os
 import sqlite3
-import pandas as pd
-from crewai import Agent, Task, Crew, Process
-from crewai_tools import NL2SQLTool
-from langchain.llms import OpenAI
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional
 import csv
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 
+from name_index import NAME_FIELDS, NameResolver, sql_literal
+from query_cache import QueryCache, explain_sql, extract_sql, schema_version
+from salesforce_records import SalesforceQueryResult, json_default
+
+# crewai, crewai_tools and their langchain/pydantic stack take several seconds
+# to import. They are only loaded once an LLM-backed query actually runs, so
+# ingest, SQL-only paths and the demo menus start instantly.
+if TYPE_CHECKING:
+    from crewai import Agent
+
+def read_matter_rows(csv_file: str) -> List[tuple]:
+    """Read a Litify export into rows matching the litify_pm__Matter__c columns"""
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        width = len(header)
+        # Blank cells become '' and short rows are padded, like the export tooling does
+        return [tuple(row + [''] * (width - len(row))) for row in reader if row]
+
+# Records from a cached query handed to the analyst; larger results are truncated
+MAX_PROMPT_RECORDS = 100
+
+# Example queries that work with Litify data structure
+EXAMPLE_QUERIES = [
+    "How many personal injury cases are in the system?",
+    "Which attorney is handling the most cases?",
+    "What are the different case types we have?",
+    "Show me all cases handled by Riley Wilson",
+    "How many matters are closed vs active?",
+    "What's the most common case stage?",
+    "Which clients have multiple matters?",
+    "Show me all pre-litigation settlements"
+]
+
 class LegalAIAssistant:
-    def __init__(self, csv_file: str = "litify_matters.csv", db_path: str = "legal_matters.db"):
+    def __init__(self, csv_file: str = "litify_matters.csv", db_path: str = "legal_matters.db",
+                 shared_agents: Optional[Callable[[], Dict[str, "Agent"]]] = None, connection_pool=None,
+                 rebuild_database: bool = True, query_cache_path: Optional[str] = None):
         self.csv_file = csv_file
         self.db_path = db_path
-        self.setup_database_from_csv()
-        self.nl2sql_tool = NL2SQLTool(db_uri=f"sqlite:///{db_path}")
+        # Getter for tenant-independent agent templates (supervisor, analyst,
+        # reviewer) shared between assistants; only called once a crew is built.
+        self.shared_agents = shared_agents
+        self.connection_pool = connection_pool
+        if rebuild_database or not Path(self.db_path).exists():
+            self.setup_database_from_csv()
+        self._nl2sql_tool = None
+        
+        # Validated NL-to-SQL mappings survive restarts; they are only reused
+        # while the matter table schema is unchanged.
+        self.query_cache = QueryCache(query_cache_path or str(Path(db_path).with_suffix(".query_cache.json")))
+        with self.connection() as conn:
+            self.query_cache.load(schema_version(conn))
+        
+        # Bumped whenever matter rows change after startup (see csv_watcher)
+        self.data_version = 0
+        self._data_change_listeners = []
+        
+        # Canonical client/attorney/assistant names, loaded on first lookup
+        self._name_resolver = None
+        self.on_data_change(self._refresh_name_index)
+
+    def close(self):
+        """Release pooled connections and the NL2SQL tool's database engine
+
+        The assistant stays usable; connections and the tool are recreated on demand.
+        """
+        tool, self._nl2sql_tool = self._nl2sql_tool, None
+        engine = getattr(tool, "engine", None) or getattr(tool, "_engine", None)
+        if engine is not None and hasattr(engine, "dispose"):
+            engine.dispose()
+        if self.connection_pool is not None:
+            self.connection_pool.close()
+
+    @property
+    def nl2sql_tool(self):
+        """NL2SQL tool for the SQL specialist, created on first LLM-backed query"""
+        if self._nl2sql_tool is None:
+            from crewai_tools import NL2SQLTool
+            self._nl2sql_tool = NL2SQLTool(db_uri=f"sqlite:///{self.db_path}")
+        return self._nl2sql_tool
+
+    def on_data_change(self, callback):
+        """Register callback(data_version), called after matter rows change"""
+        self._data_change_listeners.append(callback)
+
+    def notify_data_changed(self):
+        """Bump the data version and invalidate caches that depend on matter rows"""
+        self.data_version += 1
+        for callback in list(self._data_change_listeners):
+            try:
+                callback(self.data_version)
+            except Exception as e:
+                print(f"⚠️  Data change listener failed: {e}")
+
+    @property
+    def name_resolver(self) -> NameResolver:
+        if self._name_resolver is None:
+            with self.connection() as conn:
+                self._name_resolver = NameResolver.from_connection(conn)
+        return self._name_resolver
+
+    def resolve_name(self, text: str, field: Optional[str] = None, limit: int = 5):
+        """Map a user-typed client, attorney or assistant name to canonical names"""
+        return self.name_resolver.resolve(text, field=field, limit=limit)
+
+    def _refresh_name_index(self, data_version: int):
+        # Rebuilt from the matter table on the next lookup
+        self._name_resolver = None
+
+    @contextmanager
+    def connection(self):
+        """Yield a database connection, borrowed from the pool when one is configured"""
+        if self.connection_pool is not None:
+            with self.connection_pool.acquire() as conn:
+                yield conn
+            return
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
         
     def setup_database_from_csv(self):
         """Initialize SQLite database from CSV file with exact Litify structure"""
@@ -23,7 +138,7 @@ class LegalAIAssistant:
         
         # Read CSV and create database
         try:
-            df = pd.read_csv(self.csv_file)
+            rows = read_matter_rows(self.csv_file)
             
             # Create database connection
             conn = sqlite3.connect(self.db_path)
@@ -52,16 +167,15 @@ class LegalAIAssistant:
             conn.execute(create_table_query)
             
             # Insert data from CSV
-            for _, row in df.iterrows():
-                conn.execute("""
-                    INSERT OR REPLACE INTO litify_pm__Matter__c VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, tuple(row.fillna('')))
+            conn.executemany("""
+                INSERT OR REPLACE INTO litify_pm__Matter__c VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
             
             conn.commit()
             conn.close()
             
             print(f"✅ Database created successfully from {self.csv_file}")
-            print(f"📊 Loaded {len(df)} records")
+            print(f"📊 Loaded {len(rows)} records")
             
         except Exception as e:
             print(f"❌ Error setting up database: {e}")
@@ -86,8 +200,12 @@ e94b89a4e1ce6e8626,Morgan Smith,[Account],Morgan Davis,[RecordType],Personal Inj
         
         print(f"✅ Sample CSV created: {self.csv_file}")
         
-    def simulate_salesforce_query(self, soql_query: str) -> dict:
-        """Simulate Salesforce API response format"""
+    def simulate_salesforce_query(self, soql_query: str, compact: bool = False):
+        """Simulate Salesforce API response format
+
+        With compact=True a SalesforceQueryResult backed by the cursor rows is
+        returned instead of a dict per record; it serializes to the same JSON.
+        """
         # This simulates how the production system would work with real Salesforce API
         print(f"🔄 Simulating Salesforce SOQL Query: {soql_query}")
         
@@ -98,44 +216,30 @@ e94b89a4e1ce6e8626,Morgan Smith,[Account],Morgan Davis,[RecordType],Personal Inj
         
         # For demo, we'll convert to SQLite and return Salesforce-like format
         try:
-            conn = sqlite3.connect(self.db_path)
+            response = self._execute_soql(soql_query)
+            return response if compact else response.to_dict()
+            
+        except Exception as e:
+            print(f"❌ Error simulating Salesforce query: {e}")
+            empty = SalesforceQueryResult([], [])
+            return empty if compact else empty.to_dict()
+    
+    def _execute_soql(self, soql_query: str) -> SalesforceQueryResult:
+        """Run a query against the demo database; errors propagate to the caller"""
+        with self.connection() as conn:
             cursor = conn.cursor()
             
             # Convert SOQL to SQLite (simplified for demo)
             sqlite_query = soql_query.replace("litify_pm__Matter__c", "litify_pm__Matter__c")
             
             cursor.execute(sqlite_query)
-            results = cursor.fetchall()
-            columns = [description[0] for description in cursor.description]
-            
             # Format like Salesforce API response
-            records = []
-            for row in results:
-                record = {
-                    "attributes": {
-                        "type": "litify_pm__Matter__c",
-                        "url": f"/services/data/v58.0/sobjects/litify_pm__Matter__c/{row[0]}"
-                    }
-                }
-                for i, col in enumerate(columns):
-                    record[col] = row[i]
-                records.append(record)
-            
-            response = {
-                "totalSize": len(records),
-                "done": True,
-                "records": records
-            }
-            
-            conn.close()
-            return response
-            
-        except Exception as e:
-            print(f"❌ Error simulating Salesforce query: {e}")
-            return {"totalSize": 0, "done": True, "records": []}
+            return SalesforceQueryResult.from_cursor(cursor)
         
-    def create_agents(self):
-        """Create the specialized agents for the legal AI system"""
+    @staticmethod
+    def create_shared_agents() -> Dict[str, "Agent"]:
+        """Create the agents that do not depend on a particular matter database"""
+        from crewai import Agent
         
         # Supervisor Agent
         supervisor_agent = Agent(
@@ -148,19 +252,6 @@ e94b89a4e1ce6e8626,Morgan Smith,[Account],Morgan Davis,[RecordType],Personal Inj
             allow_delegation=True
         )
         
-        # SQL Query Agent (SOQL for Salesforce)
-        sql_agent = Agent(
-            role='SOQL Query Specialist',
-            goal='Transform natural language queries into accurate SOQL queries for Litify/Salesforce database',
-            backstory="""You are a Salesforce database specialist with expertise in Litify legal data structures. 
-            You understand how legal matter data is organized in Salesforce and can translate business questions 
-            into precise SOQL queries. You work specifically with litify_pm__Matter__c objects and related fields.
-            You know the Litify field naming conventions and relationship structures.""",
-            tools=[self.nl2sql_tool],
-            verbose=True,
-            allow_delegation=False
-        )
-        
         # Data Analysis Agent
         data_agent = Agent(
             role='Legal Data Analyst',
@@ -187,13 +278,87 @@ e94b89a4e1ce6e8626,Morgan Smith,[Account],Morgan Davis,[RecordType],Personal Inj
         
         return {
             'supervisor': supervisor_agent,
-            'sql_specialist': sql_agent,
             'data_analyst': data_agent,
             'legal_reviewer': legal_review_agent
         }
     
-    def create_tasks(self, agents: Dict[str, Agent], user_query: str):
-        """Create tasks for processing the user query"""
+    def create_agents(self, include_sql_specialist: bool = True):
+        """Create the specialized agents for the legal AI system
+
+        The SQL specialist can be left out when the query's SQL is already cached.
+        """
+        from crewai import Agent
+        if self.shared_agents is not None:
+            # kickoff() mutates agents (crew, executor, delegation tools), so every
+            # crew gets its own copies of the shared templates
+            shared_agents = {role: agent.copy() for role, agent in self.shared_agents().items()}
+        else:
+            shared_agents = self.create_shared_agents()
+        
+        if not include_sql_specialist:
+            return shared_agents
+        
+        # SQL Query Agent (SOQL for Salesforce)
+        sql_agent = Agent(
+            role='SOQL Query Specialist',
+            goal='Transform natural language queries into accurate SOQL queries for Litify/Salesforce database',
+            backstory="""You are a Salesforce database specialist with expertise in Litify legal data structures. 
+            You understand how legal matter data is organized in Salesforce and can translate business questions 
+            into precise SOQL queries. You work specifically with litify_pm__Matter__c objects and related fields.
+            You know the Litify field naming conventions and relationship structures.""",
+            tools=[self.nl2sql_tool],
+            verbose=True,
+            allow_delegation=False
+        )
+        
+        return {
+            'supervisor': shared_agents['supervisor'],
+            'sql_specialist': sql_agent,
+            'data_analyst': shared_agents['data_analyst'],
+            'legal_reviewer': shared_agents['legal_reviewer']
+        }
+    
+    def create_tasks(self, agents: Dict[str, "Agent"], user_query: str, cached_sql: Optional[str] = None,
+                     cached_response: Optional[SalesforceQueryResult] = None):
+        """Create tasks for processing the user query
+
+        When cached_response is given (the rows from the cached SQL), the SOQL
+        generation task is skipped and the rows go straight to the analyst.
+        """
+        from crewai import Task
+        
+        if cached_response is not None:
+            return self._create_analysis_tasks(agents, user_query, None, self._describe_cached_data(cached_sql, cached_response))
+        
+        name_hint = ""
+        name_matches = self.name_resolver.resolve_in_question(user_query)
+        if name_matches:
+            lines = []
+            for phrase, matches in name_matches.items():
+                confident = NameResolver.confident_matches(matches)
+                by_field: Dict[str, List[Any]] = {}
+                for match in confident or matches:
+                    by_field.setdefault(match.field, []).append(match)
+                # Partial or ambiguous names keep every candidate, grouped by column
+                alternatives = [
+                    f"{field} = {sql_literal(field_matches[0].name)}"
+                    if len(field_matches) == 1 and (confident or field_matches[0].score == 1.0)
+                    else f"{field} IN ({', '.join(sql_literal(match.name) for match in field_matches)})"
+                    for field, field_matches in by_field.items()
+                ]
+                roles = " or ".join(NAME_FIELDS[field] for field in by_field)
+                if len(alternatives) == 1:
+                    lines.append(f"- \"{phrase}\" ({roles}): {alternatives[0]}")
+                else:
+                    lines.append(f"- \"{phrase}\" ({roles}): ({' OR '.join(alternatives)})")
+            name_hint = """
+            Names in the query matched to values stored in the database. Use these
+            filters instead of LIKE. Each line is one name; where it lists columns joined
+            by OR, keep only the column whose role fits the question ("handled by" means
+            the attorney, "client" or "for" the client) or keep the whole OR group if the
+            role is unclear. Never AND those columns together. An IN list covers every
+            stored value a partial or ambiguous name could refer to:
+            """ + "\n            ".join(lines) + "\n"
         
         # Task 1: SOQL Query Generation
         sql_task = Task(
@@ -226,11 +391,31 @@ e94b89a4e1ce6e8626,Morgan Smith,[Account],Morgan Davis,[RecordType],Personal Inj
             SELECT Id, litify_pm__Display_Name__c, bis_Case_Type__c, litify_pm__Status__c 
             FROM litify_pm__Matter__c 
             WHERE litify_pm__Status__c = 'Active'
-            """,
+            {name_hint}""",
             expected_output="SOQL query and the retrieved data results formatted like Salesforce API response",
             agent=agents['sql_specialist']
         )
         
+        return [sql_task] + self._create_analysis_tasks(agents, user_query, sql_task)
+    
+    def _describe_cached_data(self, cached_sql: str, response: SalesforceQueryResult) -> str:
+        records = response.records
+        shown = records[:MAX_PROMPT_RECORDS]
+        truncated = f" (first {len(shown)} shown)" if len(shown) < len(records) else ""
+        return f"""
+            The data was retrieved with this previously validated query:
+            {cached_sql}
+            
+            Salesforce API response ({len(records)} records{truncated}):
+            {json.dumps({"totalSize": len(records), "done": True, "records": shown}, default=json_default)}
+            """
+    
+    def _create_analysis_tasks(self, agents: Dict[str, "Agent"], user_query: str, sql_task, cached_data: str = ""):
+        """Create the analysis, review and supervision tasks that follow data retrieval"""
+        from crewai import Task
+        
+        sql_context = [sql_task] if sql_task is not None else []
+        
         # Task 2: Data Analysis
         analysis_task = Task(
             description=f"""
@@ -251,10 +436,10 @@ e94b89a4e1ce6e8626,Morgan Smith,[Account],Morgan Davis,[RecordType],Personal Inj
             for legal practice management and decision-making.
             
             Remember: This data represents real legal matters, so maintain appropriate professional tone.
-            """,
+            {cached_data}""",
             expected_output="Detailed analysis and business intelligence answer to the user's query",
             agent=agents['data_analyst'],
-            context=[sql_task]
+            context=sql_context or None
         )
         
         # Task 3: Legal Review
@@ -303,19 +488,31 @@ e94b89a4e1ce6e8626,Morgan Smith,[Account],Morgan Davis,[RecordType],Personal Inj
             """,
             expected_output="Process summary and final coordinated response with production notes",
             agent=agents['supervisor'],
-            context=[sql_task, analysis_task, review_task]
+            context=sql_context + [analysis_task, review_task]
         )
         
-        return [sql_task, analysis_task, review_task, supervision_task]
+        return [analysis_task, review_task, supervision_task]
     
     def process_query(self, user_query: str):
         """Process a user query through the agent system"""
+        from crewai import Crew, Process
+        
+        # A cached question runs its validated SQL directly, skipping the SQL specialist
+        cached_sql = self.query_cache.get(user_query)
+        cached_response = None
+        if cached_sql is not None:
+            try:
+                cached_response = self._execute_soql(cached_sql)
+            except sqlite3.Error as e:
+                print(f"⚠️  Cached SQL no longer runs ({e}); regenerating it")
+                self.query_cache.discard(user_query)
+                cached_sql = None
         
         # Create agents
-        agents = self.create_agents()
+        agents = self.create_agents(include_sql_specialist=cached_response is None)
         
         # Create tasks
-        tasks = self.create_tasks(agents, user_query)
+        tasks = self.create_tasks(agents, user_query, cached_sql=cached_sql, cached_response=cached_response)
         
         # Create crew
         crew = Crew(
@@ -325,27 +522,69 @@ e94b89a4e1ce6e8626,Morgan Smith,[Account],Morgan Davis,[RecordType],Personal Inj
             verbose=True
         )
         
-        # Execute the crew
-        result = crew.kickoff()
+        # Execute the crew. It holds one pooled connection slot while it runs so
+        # the NL2SQL tool's own connections stay within the tenant's limit.
+        with self.connection() if self.connection_pool is not None else nullcontext():
+            result = crew.kickoff()
+        
+        if cached_response is None:
+            sql_output = tasks[0].output
+            self.remember_query_sql(user_query, getattr(sql_output, 'raw_output', None) or str(sql_output or ''))
         
         return result
+    
+    def remember_query_sql(self, user_query: str, sql_output: str) -> bool:
+        """Validate the SQL behind an answer and persist it for future runs"""
+        sql = extract_sql(sql_output)
+        if not sql:
+            return False
+        
+        with self.connection() as conn:
+            plan = explain_sql(conn, sql)
+        if plan is None:
+            return False
+        
+        self.query_cache.put(user_query, sql, plan)
+        try:
+            self.query_cache.save()
+        except OSError as e:
+            print(f"⚠️  Could not save query cache: {e}")
+        return True
+    
+    def warm_query_cache(self, queries=EXAMPLE_QUERIES):
+        """Check the cached SQL for known questions against the current database
+
+        Valid entries are answered without the SQL specialist from the first
+        request on; entries that no longer compile are dropped. Questions that
+        were never answered have nothing to warm until they are asked once.
+        """
+        warmed, missing = [], []
+        
+        with self.connection() as conn:
+            for query in queries:
+                sql = self.query_cache.get(query)
+                if sql is None:
+                    missing.append(query)
+                elif explain_sql(conn, sql) is None:
+                    self.query_cache.discard(query)
+                    missing.append(query)
+                else:
+                    warmed.append(query)
+        
+        print(f"🔥 Query cache: {len(warmed)} example queries ready, {len(missing)} not yet seen")
+        return warmed, missing
 
 # Example usage
 if __name__ == "__main__":
     # Initialize the legal AI assistant
     assistant = LegalAIAssistant()
+    assistant.warm_query_cache()
+    
+    # Pick up new Litify exports while the CLI is running
+    from csv_watcher import watch_csv
+    watcher = watch_csv(assistant)
     
-    # Example queries that work with Litify data structure
-    example_queries = [
-        "How many personal injury cases are in the system?",
-        "Which attorney is handling the most cases?",
-        "What are the different case types we have?",
-        "Show me all cases handled by Riley Wilson",
-        "How many matters are closed vs active?",
-        "What's the most common case stage?",
-        "Which clients have multiple matters?",
-        "Show me all pre-litigation settlements"
-    ]
+    example_queries = EXAMPLE_QUERIES
     
     print("Legal AI Assistant - Litify/Salesforce Integration Demo")
     print("=" * 60)
@@ -353,37 +592,40 @@ if __name__ == "__main__":
     print("📊 Using CSV data that matches Litify field structure")
     print("🔄 Demonstrates SOQL query generation and execution")
     
-    while True:
-        print("\nExample queries:")
-        for i, query in enumerate(example_queries, 1):
-            print(f"{i}. {query}")
+    try:
+        while True:
+            print("\nExample queries:")
+            for i, query in enumerate(example_queries, 1):
+                print(f"{i}. {query}")
         
-        user_input = input("\nEnter your query number (1-8), custom query, or 'quit' to exit: ")
+            user_input = input("\nEnter your query number (1-8), custom query, or 'quit' to exit: ")
         
-        if user_input.lower() == 'quit':
-            break
+            if user_input.lower() == 'quit':
+                break
             
-        if user_input.isdigit() and 1 <= int(user_input) <= len(example_queries):
-            query = example_queries[int(user_input) - 1]
-        else:
-            query = user_input
+            if user_input.isdigit() and 1 <= int(user_input) <= len(example_queries):
+                query = example_queries[int(user_input) - 1]
+            else:
+                query = user_input
             
-        print(f"\n🔍 Processing query: {query}")
-        print(f"🏗️  Simulating Salesforce API call...")
-        print("-" * 50)
+            print(f"\n🔍 Processing query: {query}")
+            print(f"🏗️  Simulating Salesforce API call...")
+            print("-" * 50)
         
-        try:
-            result = assistant.process_query(query)
-            print(f"\n📋 Final Result:")
-            print("=" * 50)
-            print(f"{result}")
-            print("\n🚀 Production Note:")
-            print("In production, this would query live Salesforce/Litify data via:")
-            print("- Salesforce REST API")
-            print("- OAuth authentication")
-            print("- Real-time SOQL execution")
-            print("- Live legal matter data")
+            try:
+                result = assistant.process_query(query)
+                print(f"\n📋 Final Result:")
+                print("=" * 50)
+                print(f"{result}")
+                print("\n🚀 Production Note:")
+                print("In production, this would query live Salesforce/Litify data via:")
+                print("- Salesforce REST API")
+                print("- OAuth authentication")
+                print("- Real-time SOQL execution")
+                print("- Live legal matter data")
             
-        except Exception as e:
-            print(f"❌ Error processing query: {e}")
-            print("💡 Make sure you have set up your OpenAI API key in the .env file")
\ No newline at end of file
+            except Exception as e:
+                print(f"❌ Error processing query: {e}")
+                print("💡 Make sure you have set up your OpenAI API key in the .env file")
+    finally:
+        watcher.stop()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Memory Benchmark
+Compares the dict-per-record Salesforce response with the compact SalesforceQueryResult
+"""
+
+import argparse
+import gc
+import io
+import json
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+from salesforce_records import SalesforceQueryResult
+
+MATTER_COLUMNS = (
+    "Id", "litify_pm__Display_Name__c", "litify_pm__Client__r",
+    "litify_pm__Client__r_bis_Full_Formatted_Name__c", "RecordType", "RecordType_Name",
+    "bis_Case_Type__c", "litify_pm__Status__c", "Case_Stage__c", "Case_Sub_Stage__c",
+    "litify_pm__Open_Date__c", "litify_pm__Closed_Date__c", "Primary_Legal_Assistant__r",
+    "bis_Attorney_Name__c", "Primary_Legal_Assistant__r_Name",
+)
+
+FIRST_NAMES = ("Morgan", "Avery", "Riley", "Taylor", "Jordan", "Alex", "Casey", "Jamie")
+LAST_NAMES = ("Brown", "Taylor", "Wilson", "Davis", "Smith", "Miller", "Lee", "Johnson")
+
+
+def build_database(row_count: int) -> sqlite3.Connection:
+    """Create an in-memory matter table with row_count synthetic Litify records"""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"CREATE TABLE litify_pm__Matter__c ({', '.join(f'{col} TEXT' for col in MATTER_COLUMNS)})")
+
+    def name(i, salt):
+        return f"{FIRST_NAMES[(i + salt) % 8]} {LAST_NAMES[(i * 7 + salt) % 8]}"
+
+    conn.executemany(
+        f"INSERT INTO litify_pm__Matter__c VALUES ({', '.join('?' * len(MATTER_COLUMNS))})",
+        (
+            (f"{i:018x}", name(i, 0), "[Account]", name(i, 1), "[RecordType]", "Personal Injury",
+             "PI AUTO-IN-HOUSE", "Closed", "Pre-Lit Settlement", "", "7/21/23", "8/31/23", "",
+             name(i, 2), name(i, 3))
+            for i in range(row_count)
+        )
+    )
+    conn.commit()
+    return conn
+
+
+def measure(label: str, build):
+    """Return (result, retained bytes, peak bytes, seconds) for building one response"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} retained {retained / 2**20:8.1f} MB   peak {peak / 2**20:8.1f} MB   {elapsed:6.2f}s")
+    return result, retained
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows returned by the benchmark query")
+    args = parser.parse_args(argv)
+
+    conn = build_database(args.rows)
+    query = "SELECT * FROM litify_pm__Matter__c"
+
+    print(f"📊 Memory benchmark: {args.rows:,} rows x {len(MATTER_COLUMNS)} columns")
+    print("=" * 50)
+
+    def dict_per_record():
+        # The original simulate_salesforce_query formatting
+        cursor = conn.execute(query)
+        results = cursor.fetchall()
+        columns = [description[0] for description in cursor.description]
+        records = []
+        for row in results:
+            record = {
+                "attributes": {
+                    "type": "litify_pm__Matter__c",
+                    "url": f"/services/data/v58.0/sobjects/litify_pm__Matter__c/{row[0]}"
+                }
+            }
+            for i, col in enumerate(columns):
+                record[col] = row[i]
+            records.append(record)
+        return {"totalSize": len(records), "done": True, "records": records}
+
+    def compact():
+        return SalesforceQueryResult.from_cursor(conn.execute(query))
+
+    legacy, legacy_bytes = measure("dict per record", dict_per_record)
+    legacy_json = json.dumps(legacy)
+    del legacy
+    result, compact_bytes = measure("SalesforceQueryResult", compact)
+
+    # The compact form must still serialize to the exact Salesforce JSON
+    buffer = io.StringIO()
+    result.write_json(buffer)
+    if buffer.getvalue() != legacy_json or result.to_json() != legacy_json:
+        print("❌ Compact result does not serialize to the dict-per-record JSON")
+        return 1
+
+    print(f"\n✅ Compact result retains {legacy_bytes / max(compact_bytes, 1):.1f}x less memory")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Name Index
+Fuzzy in-memory lookup of client, attorney and legal assistant names
+"""
+
+import re
+import sqlite3
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+MATTER_TABLE = "litify_pm__Matter__c"
+
+# Name columns on the matter table and how they are described to the agents
+NAME_FIELDS = {
+    "bis_Attorney_Name__c": "attorney",
+    "Primary_Legal_Assistant__r_Name": "legal assistant",
+    "litify_pm__Client__r_bis_Full_Formatted_Name__c": "client",
+}
+
+# Longest run of words in a question that is tried as a single name
+MAX_NAME_WORDS = 3
+
+# Words in a question; "O'Brien" and "Smith-Jones" stay whole, "Jamie's" yields "Jamie"
+_WORD = re.compile(r"[^\W\d_]+(?:['.-][^\W\d_]{2,})*")
+
+# Score given to every name containing a capitalized word from the question;
+# kept low so a fuzzy full-name match on the surrounding words wins
+_TOKEN_MATCH_SCORE = 0.6
+
+# Lowest score at which a unique fuzzy match is treated as the name that was meant
+CONFIDENT_MATCH_SCORE = 0.75
+
+
+class NameMatch(NamedTuple):
+    name: str
+    field: str
+    score: float
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents and collapse whitespace"""
+    decomposed = unicodedata.normalize("NFKD", name)
+    without_accents = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(without_accents.lower().split())
+
+
+def _trigrams(normalized: str) -> frozenset:
+    padded = f"  {normalized} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def sql_literal(value: str) -> str:
+    """Quote a value as an SQL string literal ("O'Brien" -> 'O''Brien')"""
+    return "'" + value.replace("'", "''") + "'"
+
+
+class NameResolver:
+    """Maps user-typed names to canonical names in memory
+
+    Exact (accent and case-insensitive) matches are a dict lookup; partial names
+    and misspellings are matched through an in-memory trigram index, so a
+    lookup takes well under a millisecond even with thousands of names.
+    """
+
+    def __init__(self, names: Iterable[Tuple[str, str]]):
+        self._names: List[Tuple[str, str, str, frozenset]] = []
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._tokens: Dict[str, List[int]] = defaultdict(list)
+
+        for name, field in names:
+            normalized = normalize_name(name)
+            grams = _trigrams(normalized)
+            name_id = len(self._names)
+            self._names.append((name, field, normalized, grams))
+            self._exact[normalized].append(name_id)
+            for gram in grams:
+                self._postings[gram].append(name_id)
+            for token in set(normalized.split()):
+                self._tokens[token].append(name_id)
+
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> "NameResolver":
+        """Load the distinct names in the matter table's name columns
+
+        Nothing is written to the database, so the schema the SQL agent sees
+        only contains the matter table.
+        """
+        names = []
+        for field in NAME_FIELDS:
+            for (name,) in conn.execute(
+                f"SELECT DISTINCT {field} FROM {MATTER_TABLE} "
+                f"WHERE {field} IS NOT NULL AND TRIM({field}) != ''"
+            ):
+                names.append((name, field))
+        return cls(names)
+
+    def __len__(self):
+        return len(self._names)
+
+    @staticmethod
+    def confident_matches(matches: List[NameMatch]) -> List[NameMatch]:
+        """Matches certain enough to filter on with =; empty when the name is ambiguous
+
+        A name stored in several columns (e.g. both an attorney and a client)
+        is ambiguous too: which column applies depends on the question.
+        """
+        exact = [match for match in matches if match.score == 1.0]
+        if exact:
+            return exact if len({match.field for match in exact}) == 1 else []
+        likely = [match for match in matches if match.score >= CONFIDENT_MATCH_SCORE]
+        return likely if len(likely) == 1 else []
+
+    def resolve(self, text: str, field: Optional[str] = None, limit: Optional[int] = 5,
+                min_score: float = 0.5) -> List[NameMatch]:
+        """Return the best canonical names for a typed name, best first (all of them if limit is None)"""
+        normalized = normalize_name(text)
+        if not normalized:
+            return []
+
+        exact = [
+            NameMatch(self._names[i][0], self._names[i][1], 1.0)
+            for i in self._exact.get(normalized, ())
+            if field is None or self._names[i][1] == field
+        ]
+        if exact:
+            return exact[:limit]
+
+        grams = _trigrams(normalized)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        tokens = normalized.split()
+        matches = []
+        for name_id, overlap in shared.items():
+            name, name_field, name_normalized, name_grams = self._names[name_id]
+            if field is not None and name_field != field:
+                continue
+
+            # Dice coefficient over trigrams tolerates typos ("Riley Wilsen")
+            score = 2 * overlap / (len(grams) + len(name_grams))
+            # Partial names ("Wilson", "Riley W") match every name they are a prefix of
+            name_tokens = name_normalized.split()
+            if all(any(nt.startswith(t) for nt in name_tokens) for t in tokens):
+                score = max(score, 0.85 * sum(map(len, tokens)) / len(name_normalized.replace(" ", "")) + 0.15)
+
+            if score >= min_score:
+                matches.append(NameMatch(name, name_field, round(score, 3)))
+
+        matches.sort(key=lambda match: (-match.score, match.name))
+        return matches[:limit]
+
+    def resolve_in_question(self, question: str, min_score: float = 0.6) -> Dict[str, List[NameMatch]]:
+        """Find the phrases in a question that look like known names
+
+        Multi-word phrases are matched fuzzily; single capitalized words only
+        when they are a whole first or last name, to avoid matching ordinary words.
+        Every candidate is returned, best first.
+        """
+        words = [(m.group(), m.start(), m.end()) for m in _WORD.finditer(question)]
+        candidates = []
+
+        for size in range(1, MAX_NAME_WORDS + 1):
+            for start in range(len(words) - size + 1):
+                phrase = question[words[start][1]:words[start + size - 1][2]]
+                if size == 1:
+                    if not phrase[0].isupper():
+                        continue
+                    matches = [
+                        NameMatch(self._names[i][0], self._names[i][1], _TOKEN_MATCH_SCORE)
+                        for i in self._tokens.get(normalize_name(phrase), ())
+                    ]
+                else:
+                    matches = self.resolve(phrase, limit=None, min_score=min_score)
+
+                if matches:
+                    candidates.append((matches[0].score, size, start, phrase, matches))
+
+        # Best-scoring phrases win; "Riley Wilson" beats both "Riley" and "by Riley Wilson"
+        found: Dict[str, List[NameMatch]] = {}
+        taken = set()
+        for _, size, start, phrase, matches in sorted(candidates, key=lambda c: (-c[0], -c[1], c[2])):
+            span = range(start, start + size)
+            if not taken.intersection(span):
+                found[phrase] = matches
+                taken.update(span)
+
+        return found
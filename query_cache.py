@@ -0,0 +1,147 @@
+"""
+Query Cache
+Persists validated question-to-SQL mappings across restarts, keyed on the matter table schema
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MATTER_TABLE = "litify_pm__Matter__c"
+
+# Fenced ```sql blocks first, then the first bare statement
+_FENCED_SQL = re.compile(r"```(?:sql|soql)?\s*((?:SELECT|WITH)\b.*?)```", re.IGNORECASE | re.DOTALL)
+# An uppercase SELECT/WITH at the start of a line, a sentence, inline code or after
+# a label ("Query: SELECT ..."); lowercase "select" in prose is never captured
+_BARE_SQL_START = re.compile(r"(?:^|[:;.`])\s*`?((?:SELECT|WITH)\b[^`]*)")
+# A following line belongs to the statement if it starts with a clause keyword or
+# the line before it cannot end a statement
+_SQL_CONTINUATION = re.compile(
+    r"\s*(?:(?:FROM|WHERE|AND|OR|NOT|GROUP|ORDER|HAVING|LIMIT|OFFSET|JOIN|INNER|LEFT|"
+    r"OUTER|CROSS|ON|UNION|EXCEPT|INTERSECT|CASE|WHEN|THEN|ELSE|END|AS|SELECT)\b|[(),])"
+)
+_OPEN_ENDED_SQL = re.compile(r"(?:[,(=]|\b(?:SELECT|FROM|WHERE|AND|OR|BY|ON|JOIN|AS))\s*$")
+
+
+def normalize_question(question: str) -> str:
+    """Key used to recognise identical questions regardless of case and spacing"""
+    return " ".join(question.split()).lower()
+
+
+def extract_sql(text: str) -> Optional[str]:
+    """Pull the SELECT statement out of the SQL specialist's output"""
+    if not text:
+        return None
+    match = _FENCED_SQL.search(text)
+    sql = match.group(1) if match else _bare_sql(text)
+    if not sql:
+        return None
+    return " ".join(sql.split(";")[0].split()) or None
+
+
+def _bare_sql(text: str) -> Optional[str]:
+    lines = text.splitlines()
+    for number, line in enumerate(lines):
+        start = _BARE_SQL_START.search(line)
+        if not start:
+            continue
+
+        statement = [start.group(1)]
+        for next_line in lines[number + 1:]:
+            if ";" in statement[-1] or not next_line.strip():
+                break
+            if not (_SQL_CONTINUATION.match(next_line) or _OPEN_ENDED_SQL.search(statement[-1])):
+                break
+            statement.append(next_line)
+        return " ".join(statement)
+    return None
+
+
+def schema_version(conn: sqlite3.Connection, table: str = MATTER_TABLE) -> str:
+    """Fingerprint of the table definition; cached SQL is only reused for the same schema"""
+    definition = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    fingerprint = json.dumps([definition[0] if definition else None, columns])
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+
+def explain_sql(conn: sqlite3.Connection, sql: str) -> Optional[List[str]]:
+    """Return the query plan for a read-only statement, or None if it isn't valid here"""
+    if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    try:
+        return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+    except sqlite3.Error:
+        return None
+
+
+class QueryCache:
+    """Question-to-validated-SQL cache stored as JSON next to the matter database"""
+
+    def __init__(self, path: str = "query_cache.json"):
+        self.path = Path(path)
+        self.schema_version: Optional[str] = None
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self, current_schema_version: str) -> int:
+        """Load entries written for this schema version; returns how many were loaded"""
+        with self._lock:
+            self.schema_version = current_schema_version
+            self._entries = {}
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                return 0
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable query cache {self.path}: {e}")
+                return 0
+
+            if not isinstance(data, dict) or not isinstance(data.get("entries", {}), dict):
+                print(f"⚠️  Ignoring unreadable query cache {self.path}: expected a JSON object")
+                return 0
+
+            # Entries from another schema version may reference missing columns
+            if data.get("schema_version") == current_schema_version:
+                self._entries = data.get("entries", {})
+            return len(self._entries)
+
+    def save(self):
+        """Write the cache atomically so concurrent workers never read a partial file"""
+        with self._lock:
+            data = {"schema_version": self.schema_version, "entries": self._entries}
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+    def get(self, question: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(normalize_question(question))
+        return entry["sql"] if entry else None
+
+    def put(self, question: str, sql: str, plan: List[str]):
+        with self._lock:
+            self._entries[normalize_question(question)] = {
+                "question": question,
+                "sql": sql,
+                "plan": plan,
+                "validated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+
+    def discard(self, question: str):
+        with self._lock:
+            self._entries.pop(normalize_question(question), None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, question: str):
+        return normalize_question(question) in self._entries
@@ -0,0 +1,166 @@
+"""
+Salesforce Records
+Compact, cursor-backed representation of Salesforce SOQL query responses
+"""
+
+import json
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, List, Sequence as SequenceType, TextIO
+
+SOBJECT_URL_PREFIX = "/services/data/v58.0/sobjects"
+
+
+class SalesforceRecord(Mapping):
+    """Read-only view of one row, shaped like a Salesforce API record"""
+
+    __slots__ = ("_result", "_row")
+
+    def __init__(self, result: "SalesforceQueryResult", row: tuple):
+        self._result = result
+        self._row = row
+
+    @property
+    def attributes(self) -> dict:
+        sobject_type = self._result.sobject_type
+        return {
+            "type": sobject_type,
+            "url": f"{SOBJECT_URL_PREFIX}/{sobject_type}/{self._row[0]}"
+        }
+
+    def __getitem__(self, key):
+        if key == "attributes":
+            return self.attributes
+        return self._row[self._result.column_index[key]]
+
+    def __iter__(self):
+        yield "attributes"
+        yield from self._result.column_index
+
+    def __len__(self):
+        return len(self._result.column_index) + 1
+
+    def to_dict(self) -> dict:
+        record = {"attributes": self.attributes}
+        row = self._row
+        for col, i in self._result.column_index.items():
+            record[col] = row[i]
+        return record
+
+    def __repr__(self):
+        return f"SalesforceRecord({self.to_dict()!r})"
+
+
+class SalesforceRecordList(Sequence):
+    """Sequence of record views, created on access rather than stored"""
+
+    __slots__ = ("_result",)
+
+    def __init__(self, result: "SalesforceQueryResult"):
+        self._result = result
+
+    def __getitem__(self, index):
+        rows = self._result.rows
+        if isinstance(index, slice):
+            return [SalesforceRecord(self._result, row) for row in rows[index]]
+        return SalesforceRecord(self._result, rows[index])
+
+    def __len__(self):
+        return len(self._result.rows)
+
+    def __iter__(self):
+        result = self._result
+        for row in result.rows:
+            yield SalesforceRecord(result, row)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+
+def json_default(obj):
+    """json.dumps default= hook for compact results, records and record lists"""
+    if isinstance(obj, (SalesforceQueryResult, SalesforceRecord)):
+        return obj.to_dict()
+    if isinstance(obj, SalesforceRecordList):
+        return [record.to_dict() for record in obj]
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class SalesforceQueryResult(Mapping):
+    """SOQL query response backed by a shared column index and the raw cursor rows
+
+    Reads like the Salesforce response dict ({"totalSize", "done", "records"})
+    but keeps one tuple per row instead of a dict per record. It is not a dict,
+    so plain json.dumps() rejects it: serialize with to_json() / write_json(),
+    or pass default=json_default to json.dumps().
+    """
+
+    __slots__ = ("sobject_type", "columns", "column_index", "rows")
+
+    _KEYS = ("totalSize", "done", "records")
+
+    def __init__(self, columns: Iterable[str], rows: List[tuple], sobject_type: str = "litify_pm__Matter__c"):
+        self.sobject_type = sobject_type
+        self.columns = tuple(columns)
+        # Later duplicates win, matching how the per-record dicts were filled in
+        self.column_index: Dict[str, int] = {col: i for i, col in enumerate(self.columns)}
+        self.rows: SequenceType[tuple] = rows
+
+    @classmethod
+    def from_cursor(cls, cursor, sobject_type: str = "litify_pm__Matter__c") -> "SalesforceQueryResult":
+        """Build a result from an executed DB-API cursor"""
+        # Litify columns are low-cardinality (statuses, case types, attorney
+        # names), so equal strings are stored once and shared between rows.
+        shared = {}
+        share = shared.setdefault
+        rows = [
+            tuple([share(value, value) if type(value) is str else value for value in row])
+            for row in cursor
+        ]
+        columns = [description[0] for description in cursor.description or ()]
+        return cls(columns, rows, sobject_type)
+
+    @property
+    def records(self) -> SalesforceRecordList:
+        return SalesforceRecordList(self)
+
+    def __getitem__(self, key):
+        if key == "totalSize":
+            return len(self.rows)
+        if key == "done":
+            return True
+        if key == "records":
+            return self.records
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def to_dict(self) -> dict:
+        """Materialize the classic dict-per-record Salesforce response"""
+        return {
+            "totalSize": len(self.rows),
+            "done": True,
+            "records": [record.to_dict() for record in self.records]
+        }
+
+    def write_json(self, stream: TextIO):
+        """Serialize to the Salesforce JSON shape one record at a time"""
+        stream.write(f'{{"totalSize": {len(self.rows)}, "done": true, "records": [')
+        for i, record in enumerate(self.records):
+            if i:
+                stream.write(", ")
+            stream.write(json.dumps(record.to_dict()))
+        stream.write("]}")
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    def __repr__(self):
+        return f"SalesforceQueryResult(totalSize={len(self.rows)}, columns={list(self.columns)!r})"
@@ -0,0 +1,191 @@
+"""
+Tenant Registry
+Routes legal queries for several firms to their own Litify matter databases
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from legal_ai_assistant import LegalAIAssistant
+
+
+class TenantConnectionPool:
+    """Bounded pool of SQLite connections for a single tenant database"""
+
+    def __init__(self, db_path: str, max_connections: int = 4, timeout: float = 30.0):
+        self.db_path = db_path
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._draining = False
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a connection, waiting while the tenant is at its connection limit"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(
+                f"No free connection for {self.db_path} "
+                f"(limit {self.max_connections}) after {self.timeout}s"
+            )
+
+        try:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+
+            try:
+                yield conn
+            finally:
+                with self._lock:
+                    if self._draining:
+                        conn.close()
+                    else:
+                        self._idle.append(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Stop keeping connections open once they are returned
+
+        Callers that still hold the tenant's assistant (e.g. a query running
+        while the tenant is evicted) can keep borrowing; those connections
+        are simply closed on return instead of being pooled.
+        """
+        with self._lock:
+            self._draining = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+@dataclass
+class TenantConfig:
+    """Where a tenant's Litify export and matter database live"""
+    csv_file: str
+    db_path: str
+    max_connections: Optional[int] = None
+
+
+class TenantRegistry:
+    """Maps tenant IDs to matter databases, keeping only recently used tenants open"""
+
+    def __init__(self, max_open_tenants: int = 8, max_connections_per_tenant: int = 4):
+        self.max_open_tenants = max_open_tenants
+        self.max_connections_per_tenant = max_connections_per_tenant
+        self._tenants: Dict[str, TenantConfig] = {}
+        self._open: "OrderedDict[str, LegalAIAssistant]" = OrderedDict()
+        self._shared_agents = None
+        self._shared_agents_lock = threading.Lock()
+        # Guards the maps above; never held while a tenant database is opened
+        self._lock = threading.RLock()
+        self._opening: Dict[str, threading.Lock] = {}
+
+    def register(self, tenant_id: str, csv_file: str, db_path: str,
+                 max_connections: Optional[int] = None):
+        """Register a tenant without opening its database"""
+        with self._lock:
+            if tenant_id in self._open:
+                self._close_tenant(tenant_id)
+            self._tenants[tenant_id] = TenantConfig(csv_file, db_path, max_connections)
+
+    def unregister(self, tenant_id: str):
+        """Forget a tenant, closing its database if it is open"""
+        with self._lock:
+            self._close_tenant(tenant_id)
+            self._tenants.pop(tenant_id, None)
+
+    @property
+    def tenant_ids(self):
+        return list(self._tenants)
+
+    @property
+    def open_tenant_ids(self):
+        return list(self._open)
+
+    def get_assistant(self, tenant_id: str) -> LegalAIAssistant:
+        """Return the tenant's assistant, opening its database on first use"""
+        with self._lock:
+            assistant = self._open.get(tenant_id)
+            if assistant is not None:
+                self._open.move_to_end(tenant_id)
+                return assistant
+            if tenant_id not in self._tenants:
+                raise KeyError(f"Unknown tenant: {tenant_id}")
+            opening_lock = self._opening.setdefault(tenant_id, threading.Lock())
+
+        # Only callers of this tenant wait while its database is built from CSV
+        with opening_lock:
+            with self._lock:
+                assistant = self._open.get(tenant_id)
+                if assistant is not None:
+                    self._open.move_to_end(tenant_id)
+                    return assistant
+                config = self._tenants.get(tenant_id)
+                if config is None:
+                    raise KeyError(f"Unknown tenant: {tenant_id}")
+
+            assistant = self._open_assistant(config)
+
+            with self._lock:
+                self._open[tenant_id] = assistant
+                self._opening.pop(tenant_id, None)
+                while len(self._open) > self.max_open_tenants:
+                    lru_tenant_id = next(iter(self._open))
+                    self._close_tenant(lru_tenant_id)
+
+            return assistant
+
+    def process_query(self, tenant_id: str, user_query: str):
+        """Process a user query against the tenant's matter database"""
+        return self.get_assistant(tenant_id).process_query(user_query)
+
+    def simulate_salesforce_query(self, tenant_id: str, soql_query: str) -> dict:
+        """Run a SOQL query against the tenant's matter database"""
+        return self.get_assistant(tenant_id).simulate_salesforce_query(soql_query)
+
+    def close(self, tenant_id: str):
+        """Close a tenant's database; it is reopened on next use"""
+        with self._lock:
+            self._close_tenant(tenant_id)
+
+    def close_all(self):
+        with self._lock:
+            for tenant_id in list(self._open):
+                self._close_tenant(tenant_id)
+
+    def _open_assistant(self, config: TenantConfig) -> LegalAIAssistant:
+        pool = TenantConnectionPool(
+            config.db_path,
+            max_connections=config.max_connections or self.max_connections_per_tenant
+        )
+        # Existing tenant databases are reused as-is; only missing ones are
+        # built from the tenant's CSV export.
+        return LegalAIAssistant(
+            csv_file=config.csv_file,
+            db_path=config.db_path,
+            shared_agents=self._get_shared_agents,
+            connection_pool=pool,
+            rebuild_database=not Path(config.db_path).exists()
+        )
+
+    def _close_tenant(self, tenant_id: str):
+        # Evicted assistants keep working for callers that still hold them;
+        # they just stop holding pooled connections and engines.
+        assistant = self._open.pop(tenant_id, None)
+        if assistant is not None:
+            assistant.close()
+
+    def _get_shared_agents(self):
+        # Built on the first LLM-backed query of any tenant; each crew gets copies
+        with self._shared_agents_lock:
+            if self._shared_agents is None:
+                self._shared_agents = LegalAIAssistant.create_shared_agents()
+            return self._shared_agents